@@ -1,25 +1,55 @@
 import numpy as np
-import pandas as pd
+import torch
 from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
 import json
 import datetime
+import hashlib
+import itertools
+import os
+import re
 from typing import Dict, List, Tuple, Optional
+from collections import OrderedDict, deque
 import logging
 from dataclasses import dataclass, asdict
 from enum import Enum
+from functools import lru_cache
+
+try:
+    import simsimd
+except ImportError:  # optional SIMD similarity kernels
+    simsimd = None
+
+try:
+    import orjson
+except ImportError:  # optional fast JSON export
+    orjson = None
+
+try:
+    from numba import njit
+except ImportError:  # optional JIT for top-k selection
+    njit = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Words ignored by the lexical prefilter
+_STOPWORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is", "it",
+    "of", "on", "or", "that", "the", "this", "to", "was", "with"
+})
+
+def _tokenize(text: str) -> List[str]:
+    """Split text into lowercase word tokens without stopwords"""
+    return [token for token in re.findall(r"[a-z0-9]+", text.lower()) if token not in _STOPWORDS]
+
 class RewardType(Enum):
     BRONZE = "bronze"
     SILVER = "silver"
     GOLD = "gold"
     PLATINUM = "platinum"
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class StudentResponse:
     student_id: str
     question_id: str
@@ -51,18 +81,254 @@ class EducatorAlert:
     timestamp: datetime.datetime
     action_required: bool
 
+class ONNXEncoder:
+    """Sentence encoder that runs an exported model with ONNX Runtime"""
+    
+    def __init__(self, model_name: str, export_dir: str = None, num_threads: int = None,
+                 quantize: bool = False, max_seq_length: int = 256):
+        """Export the model to ONNX (once) and open an optimized inference session"""
+        import onnxruntime as ort
+        from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+        from optimum.onnxruntime.configuration import AutoQuantizationConfig
+        from transformers import AutoTokenizer
+        
+        if not export_dir:
+            export_dir = os.path.join(os.path.expanduser("~"), ".cache", "student_feedback_system",
+                                      "onnx", model_name.replace("/", "_"))
+        
+        model_path = os.path.join(export_dir, "model.onnx")
+        if not os.path.exists(model_path):
+            logger.info(f"Exporting {model_name} to ONNX in {export_dir}")
+            ORTModelForFeatureExtraction.from_pretrained(model_name, export=True).save_pretrained(export_dir)
+        
+        # Dynamic INT8 quantization lets matmuls use VNNI/AVX-512 int8 instructions
+        if quantize:
+            quantized_path = os.path.join(export_dir, "model_quantized.onnx")
+            if not os.path.exists(quantized_path):
+                logger.info(f"Quantizing {model_path} to INT8")
+                quantizer = ORTQuantizer.from_pretrained(export_dir, file_name="model.onnx")
+                quantizer.quantize(save_dir=export_dir,
+                                   quantization_config=AutoQuantizationConfig.avx512_vnni(is_static=False))
+            model_path = quantized_path
+        
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name, use_fast=True)
+        
+        # Truncate where SentenceTransformer does (its max_seq_length, 256 for
+        # all-MiniLM-L6-v2), not at the tokenizer's 512-token model_max_length
+        self.max_seq_length = max_seq_length
+        
+        # Let ORT fuse attention/GELU/LayerNorm subgraphs and use every core
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.intra_op_num_threads = num_threads or os.cpu_count() or 1
+        self.session = ort.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+        self._input_names = {model_input.name for model_input in self.session.get_inputs()}
+    
+    def encode(self, sentences: List[str], batch_size: int = 32, convert_to_numpy: bool = True,
+               normalize_embeddings: bool = False, device: str = None) -> np.ndarray:
+        """Encode sentences with mean pooling, mirroring SentenceTransformer.encode"""
+        # Sort by token length and pad each mini-batch only to its own longest member
+        lengths = [len(ids) for ids in self.tokenizer(sentences, truncation=True,
+                                                      max_length=self.max_seq_length)["input_ids"]]
+        order = np.argsort(lengths, kind="stable")
+        
+        batches = []
+        for start in range(0, len(sentences), batch_size):
+            batch = [sentences[i] for i in order[start:start + batch_size]]
+            features = self.tokenizer(batch, padding=True, truncation=True,
+                                      max_length=self.max_seq_length, return_tensors="np")
+            feeds = {name: value for name, value in features.items() if name in self._input_names}
+            token_embeddings = self.session.run(None, feeds)[0]
+            
+            # Mean-pool over real tokens only
+            mask = features["attention_mask"][..., None].astype(np.float32)
+            batches.append((token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None))
+        
+        # Restore the caller's ordering
+        embeddings = np.concatenate(batches)[np.argsort(order)]
+        
+        if normalize_embeddings:
+            embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+        
+        return embeddings
+
+def _ranks_at_or_above(a: float, b: float) -> bool:
+    """Whether a later value a sorts ahead of an earlier value b: NaN first, ties to a"""
+    return a != a or (b == b and a >= b)
+
+if njit is not None:
+    _ranks_at_or_above = njit(inline="always")(_ranks_at_or_above)
+
+def _top_k_buffer(similarities: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k largest similarities, best first, via a sorted size-k buffer"""
+    k = min(k, similarities.shape[0])
+    indices = np.empty(k, dtype=np.int64)
+    values = np.empty(k, dtype=similarities.dtype)
+    count = 0
+    for i in range(similarities.shape[0]):
+        value = similarities[i]
+        if count < k:
+            pos = count
+            count += 1
+        elif _ranks_at_or_above(value, values[k - 1]):
+            pos = k - 1
+        else:
+            continue
+        
+        # Shift entries this one ranks ahead of down so the buffer stays sorted
+        while pos > 0 and _ranks_at_or_above(value, values[pos - 1]):
+            values[pos] = values[pos - 1]
+            indices[pos] = indices[pos - 1]
+            pos -= 1
+        values[pos] = value
+        indices[pos] = i
+    return indices
+
+def _top_k_argsort(similarities: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k largest similarities, best first, via a stable argsort"""
+    return np.argsort(similarities, kind="stable")[::-1][:k]
+
+# A single pass is fastest once compiled; otherwise let NumPy sort. Both order
+# like a reversed stable argsort: NaN first, and the later index wins ties
+top_k_indices = njit(cache=True)(_top_k_buffer) if njit is not None else _top_k_argsort
+
+@lru_cache(maxsize=3)
+def _feedback_template(bucket: int) -> Tuple[Tuple[str, ...], Tuple[str, ...], Tuple[str, ...], str]:
+    """Strengths, improvement areas, tips and summary text for a score bucket"""
+    if bucket == 2:
+        return (
+            ("Demonstrates strong understanding of key concepts",
+             "Uses appropriate terminology",
+             "Provides clear explanations"),
+            (),
+            ("Try to add more examples to strengthen your explanations",
+             "Consider exploring advanced applications of these concepts"),
+            "You've shown excellent understanding of this topic. Your response demonstrates clear thinking and good use of relevant concepts."
+        )
+    if bucket == 1:
+        return (
+            ("Shows good grasp of basic concepts",
+             "Attempts to explain reasoning"),
+            ("Could use more specific terminology",
+             "Explanations could be more detailed"),
+            ("Review key vocabulary for this topic",
+             "Practice explaining concepts in your own words",
+             "Try to include specific examples"),
+            "You're on the right track! Your response shows good understanding, with room for more detail and precision."
+        )
+    return (
+        ("Shows effort in attempting the question",),
+        ("Needs to review fundamental concepts",
+         "Requires more specific and detailed responses"),
+        ("Review the lesson materials again",
+         "Ask your teacher for clarification on confusing topics",
+         "Practice with similar problems",
+         "Try to break down complex problems into smaller steps"),
+        "Keep working on this topic. Review the key concepts and try to be more specific in your explanations."
+    )
+
 class FeedbackGenerator:
-    def __init__(self, model_name: str = 'sentence-transformers/all-MiniLM-L6-v2'):
+    # Responses with fewer content words than this that share none with any
+    # reference skip the model and score PREFILTER_SCORE
+    PREFILTER_MAX_TOKENS = 4
+    PREFILTER_SCORE = 0.2
+    
+    def __init__(self, model_name: str = 'sentence-transformers/all-MiniLM-L6-v2',
+                 reduced_precision: bool = True, use_onnx: bool = False,
+                 embedding_cache_size: int = 10000, compile_model: bool = False,
+                 num_threads: Optional[int] = None, quantize_int8: bool = False,
+                 fp16_similarity: bool = False):
         """Initialize the feedback generation system"""
+        # Thread counts are process-wide, so only override them when asked to
+        if num_threads:
+            self._configure_threads(num_threads)
+        
         logger.info(f"Loading model: {model_name}")
-        self.model = SentenceTransformer(model_name)
+        if use_onnx:
+            # The ONNX session runs on the CPU execution provider
+            self.device = 'cpu'
+            self.model = ONNXEncoder(model_name, num_threads=num_threads, quantize=quantize_int8)
+        else:
+            self.device = 'cuda' if torch.cuda.is_available() else 'cpu'
+            self.model = SentenceTransformer(model_name, device=self.device)
+            # INT8 is opt-in on CPU (and ONNX): its similarity drift is not yet
+            # validated against the hard reward cutoffs, unlike FP16 on GPU
+            if self.device == 'cuda' and reduced_precision:
+                self.model = self.model.half()
+            elif self.device == 'cpu' and quantize_int8:
+                self._quantize_int8()
+            self.model.eval()
+            if compile_model:
+                self._compile_model()
         self.feedback_history = []
         self.educator_alerts = []
         
+        # Serialized alerts in creation order, trimmed to the dashboard window on read
+        self._recent_alert_dicts: deque = deque()
+        
+        # Running per-student and class aggregates, updated as feedback is stored
+        self._per_student: Dict[str, dict] = {}
+        self.class_score_sum = 0.0
+        self.class_score_count = 0
+        
+        # Monotonic suffix that keeps ids unique within the same second
+        self._id_counter = itertools.count(1)
+        
+        # LRU of embeddings keyed by a hash of their text, so repeats skip the model
+        self._emb_cache: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+        self._emb_cache_size = embedding_cache_size
+        
         # Load reference answers and reward criteria
         self.reference_answers = self._load_reference_answers()
         self.reward_criteria = self._setup_reward_criteria()
         
+        # (min_score, reward_type, points) ordered from the highest threshold down
+        self._reward_table = sorted(
+            ((criteria["min_score"], reward_type, criteria["points"])
+             for reward_type, criteria in self.reward_criteria.items()),
+            key=lambda row: row[0], reverse=True
+        )
+        
+        # Flatten (dropping duplicates) and embed the static reference answers once per subject
+        self.flat_refs: Dict[str, List[str]] = {}
+        self.reference_embeddings: Dict[str, np.ndarray] = {}
+        self._reference_embeddings_f16: Dict[str, np.ndarray] = {}
+        self._fp16_similarity = fp16_similarity and simsimd is not None
+        self._ref_token_sets: Dict[str, List[set]] = {}
+        for subject, subject_refs in self.reference_answers.items():
+            self.flat_refs[subject] = list(dict.fromkeys(
+                ref for topic_refs in subject_refs.values() for ref in topic_refs
+            ))
+            self.reference_embeddings[subject] = self._encode(self.flat_refs[subject]).astype(np.float32, copy=False)
+            if self._fp16_similarity:
+                self._reference_embeddings_f16[subject] = self.reference_embeddings[subject].astype(np.float16)
+            self._ref_token_sets[subject] = [set(_tokenize(ref)) for ref in self.flat_refs[subject]]
+        
+    @staticmethod
+    def _configure_threads(num_threads: int):
+        """Set PyTorch's intra-op thread count and keep a single inter-op thread"""
+        torch.set_num_threads(num_threads)
+        try:
+            torch.set_num_interop_threads(1)
+        except RuntimeError:
+            # Can only be set once per process, before any parallel work starts
+            logger.debug("Inter-op thread count already configured")
+    
+    def _quantize_int8(self):
+        """Swap the model's Linear layers for dynamic INT8 versions for CPU inference"""
+        self.model = torch.quantization.quantize_dynamic(
+            self.model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+        
+    def _compile_model(self):
+        """Compile the underlying transformer for fused kernels (PyTorch 2.0+)"""
+        if not hasattr(torch, "compile"):
+            logger.warning("torch.compile requires PyTorch 2.0+, running the model uncompiled")
+            return
+        
+        transformer = self.model[0]
+        transformer.auto_model = torch.compile(transformer.auto_model, mode="reduce-overhead")
+        
     def _load_reference_answers(self) -> Dict:
         """Load reference answers for different subjects"""
         return {
@@ -113,219 +379,320 @@ class FeedbackGenerator:
             RewardType.BRONZE: {"min_score": 0.4, "points": 25, "description": "Keep trying!"}
         }
     
+    def warmup(self):
+        """Run one throwaway forward pass so lazy initialization isn't timed"""
+        with torch.inference_mode():
+            self.model.encode(["warmup"], convert_to_numpy=True, device=self.device)
+        
+        # Trigger the top-k kernel's JIT compilation as well
+        top_k_indices(np.zeros(3, dtype=np.float32), 3)
+    
+    def clear_embedding_cache(self):
+        """Drop all cached embeddings so the next texts go through the model"""
+        self._emb_cache.clear()
+    
+    def _encode(self, texts: List[str], batch_size: int = 64) -> np.ndarray:
+        """Encode texts, serving previously seen texts from the embedding cache"""
+        keys = [hashlib.blake2b(text.encode(), digest_size=16).digest() for text in texts]
+        
+        # Only run the model on texts that are not cached yet
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key in self._emb_cache:
+                self._emb_cache.move_to_end(key)
+            else:
+                missing.setdefault(key, text)
+        
+        if missing:
+            # Both backends length-sort into mini-batches internally to minimize padding
+            with torch.inference_mode():
+                embeddings = self.model.encode(list(missing.values()), batch_size=batch_size,
+                                               convert_to_numpy=True, normalize_embeddings=True,
+                                               device=self.device)
+            # Copy each row so a cached entry doesn't keep its whole batch alive
+            self._emb_cache.update(zip(missing, (embedding.copy() for embedding in embeddings)))
+        
+        result = np.stack([self._emb_cache[key] for key in keys])
+        
+        # Evict the least recently used embeddings beyond the cache size
+        while len(self._emb_cache) > self._emb_cache_size:
+            self._emb_cache.popitem(last=False)
+        
+        return result
+    
+    def _similarity_matrix(self, query_embeddings: np.ndarray, subject: str) -> np.ndarray:
+        """Cosine similarity of each query embedding (rows) against a subject's references (columns)"""
+        if simsimd is not None:
+            # SimSIMD's FP16 kernels halve the bytes read per reference, but shift
+            # scores by ~1e-4, enough to move a response across a reward cutoff,
+            # so FP32 is the default
+            if self._fp16_similarity:
+                distances = simsimd.cdist(query_embeddings.astype(np.float16),
+                                          self._reference_embeddings_f16[subject], metric="cosine")
+            else:
+                distances = simsimd.cdist(query_embeddings.astype(np.float32, copy=False),
+                                          self.reference_embeddings[subject], metric="cosine")
+            return 1.0 - np.asarray(distances, dtype=np.float32)
+        
+        # Embeddings are unit length, so cosine similarity is a dot product; FP16
+        # model output is widened because the top-k kernel only handles FP32
+        return (query_embeddings @ self.reference_embeddings[subject].T).astype(np.float32, copy=False)
+    
+    def _is_clearly_off_topic(self, student_response: StudentResponse) -> bool:
+        """Cheap lexical check for short responses sharing no words with any reference"""
+        tokens = set(_tokenize(student_response.response_text))
+        if len(tokens) >= self.PREFILTER_MAX_TOKENS:
+            return False
+        
+        ref_token_sets = self._ref_token_sets.get(student_response.subject.lower())
+        if ref_token_sets is None:
+            return False
+        
+        keyword_tokens = set(_tokenize(" ".join(student_response.expected_keywords or [])))
+        return not keyword_tokens & tokens and not any(tokens & ref_tokens for ref_tokens in ref_token_sets)
+    
     def analyze_response(self, student_response: StudentResponse) -> Tuple[float, List[str]]:
         """Analyze student response against reference answers"""
+        return self.analyze_responses([student_response])[0]
+    
+    def analyze_responses(self, student_responses: List[StudentResponse]) -> List[Tuple[float, List[str]]]:
+        """Analyze a batch of student responses with a single encoder pass"""
+        if not student_responses:
+            return []
+        
+        results = [(0.5, []) for _ in student_responses]
+        
+        # Validate and prefilter each response on its own so one malformed response
+        # doesn't fail the batch; unknown subjects and obviously off-topic short
+        # answers skip the model entirely
+        encode_indices = []
+        keyword_texts: Dict[Tuple[str, ...], str] = {}
+        for i, student_response in enumerate(student_responses):
+            try:
+                if not isinstance(student_response.response_text, str):
+                    raise TypeError(f"response_text must be a string, not "
+                                    f"{type(student_response.response_text).__name__}")
+                keywords = tuple(student_response.expected_keywords or ())
+                keyword_text = " ".join(keywords)
+                
+                subject = student_response.subject.lower()
+                if subject not in self.reference_embeddings:
+                    logger.warning(f"No reference answers found for subject: {subject}")
+                elif self._is_clearly_off_topic(student_response):
+                    results[i] = (self.PREFILTER_SCORE, [])
+                else:
+                    encode_indices.append(i)
+                    if keywords:
+                        keyword_texts.setdefault(keywords, keyword_text)
+            except Exception as e:
+                logger.error(f"Error analyzing response: {str(e)}")
+                results[i] = (0.0, [])
+        
+        if not encode_indices:
+            return results
+        
+        # Encode the responses plus each distinct keyword list in one pass; the
+        # embedding cache serves keyword lists shared across questions
+        texts = [student_responses[i].response_text for i in encode_indices]
+        keyword_rows = {keywords: len(texts) + row for row, keywords in enumerate(keyword_texts)}
+        
         try:
-            # Get relevant reference answers
-            subject_refs = self.reference_answers.get(student_response.subject.lower(), {})
-            if not subject_refs:
-                logger.warning(f"No reference answers found for subject: {student_response.subject}")
-                return 0.5, []
-            
-            # Flatten all reference answers for the subject
-            all_refs = []
-            for topic_refs in subject_refs.values():
-                all_refs.extend(topic_refs)
-            
-            # Add expected keywords if provided
-            if student_response.expected_keywords:
-                keyword_text = " ".join(student_response.expected_keywords)
-                all_refs.append(keyword_text)
-            
-            # Encode student response and reference answers
-            student_embedding = self.model.encode([student_response.response_text])
-            reference_embeddings = self.model.encode(all_refs)
+            embeddings = self._encode(texts + list(keyword_texts.values()))
             
-            # Calculate similarities
-            similarities = cosine_similarity(student_embedding, reference_embeddings)[0]
-            max_similarity = np.max(similarities)
+            # Group embedding rows by subject so each group is scored with one matmul
+            subject_groups: Dict[str, List[int]] = {}
+            for row, i in enumerate(encode_indices):
+                subject_groups.setdefault(student_responses[i].subject.lower(), []).append(row)
             
-            # Find best matching references
-            top_indices = np.argsort(similarities)[-3:][::-1]  # Top 3 matches
-            best_matches = [all_refs[i] for i in top_indices if similarities[i] > 0.3]
-            
-            return float(max_similarity), best_matches
+            for subject, rows in subject_groups.items():
+                subject_refs = self.flat_refs[subject]
+                similarity_matrix = self._similarity_matrix(embeddings[rows], subject)
+                
+                for row, similarities in zip(rows, similarity_matrix):
+                    i = encode_indices[row]
+                    student_response = student_responses[i]
+                    all_refs = subject_refs
+                    
+                    # Score the expected keywords as one extra reference
+                    if student_response.expected_keywords:
+                        keywords = tuple(student_response.expected_keywords)
+                        keyword_embedding = embeddings[keyword_rows[keywords]]
+                        similarities = np.append(similarities,
+                                                 np.float32(np.dot(embeddings[row], keyword_embedding)))
+                        all_refs = subject_refs + [keyword_texts[keywords]]
+                    
+                    max_similarity = np.max(similarities)
+                    
+                    # Find best matching references
+                    top_indices = top_k_indices(similarities, 3)  # Top 3 matches
+                    best_matches = [all_refs[j] for j in top_indices if similarities[j] > 0.3]
+                    
+                    results[i] = (float(max_similarity), best_matches)
             
         except Exception as e:
-            logger.error(f"Error analyzing response: {str(e)}")
-            return 0.0, []
+            # Encoder or scoring failure: every response sent to the model fails
+            logger.error(f"Error analyzing responses: {str(e)}")
+            for i in encode_indices:
+                results[i] = (0.0, [])
+        
+        return results
     
     def determine_reward(self, similarity_score: float) -> Tuple[RewardType, int]:
         """Determine reward type and points based on similarity score"""
-        for reward_type, criteria in self.reward_criteria.items():
-            if similarity_score >= criteria["min_score"]:
-                return reward_type, criteria["points"]
-        
-        # Default to bronze if below all thresholds
-        return RewardType.BRONZE, 10
+        # First threshold met wins; default to bronze if below all thresholds
+        return next(((reward_type, points) for min_score, reward_type, points in self._reward_table
+                     if similarity_score >= min_score), (RewardType.BRONZE, 10))
     
     def generate_personalized_feedback(self, student_response: StudentResponse, 
                                      similarity_score: float, 
                                      best_matches: List[str]) -> Dict:
         """Generate personalized feedback based on analysis"""
         
-        # Determine strengths and areas for improvement
-        strengths = []
-        improvement_areas = []
-        tips = []
-        
-        if similarity_score >= 0.8:
-            strengths.extend([
-                "Demonstrates strong understanding of key concepts",
-                "Uses appropriate terminology",
-                "Provides clear explanations"
-            ])
-            tips.extend([
-                "Try to add more examples to strengthen your explanations",
-                "Consider exploring advanced applications of these concepts"
-            ])
-        elif similarity_score >= 0.6:
-            strengths.extend([
-                "Shows good grasp of basic concepts",
-                "Attempts to explain reasoning"
-            ])
-            improvement_areas.extend([
-                "Could use more specific terminology",
-                "Explanations could be more detailed"
-            ])
-            tips.extend([
-                "Review key vocabulary for this topic",
-                "Practice explaining concepts in your own words",
-                "Try to include specific examples"
-            ])
-        else:
-            strengths.append("Shows effort in attempting the question")
-            improvement_areas.extend([
-                "Needs to review fundamental concepts",
-                "Requires more specific and detailed responses"
-            ])
-            tips.extend([
-                "Review the lesson materials again",
-                "Ask your teacher for clarification on confusing topics",
-                "Practice with similar problems",
-                "Try to break down complex problems into smaller steps"
-            ])
+        # Score bucket: 2 for >= 0.8, 1 for >= 0.6, otherwise 0
+        bucket = 2 if similarity_score >= 0.8 else 1 if similarity_score >= 0.6 else 0
+        strengths, improvement_areas, tips, summary = _feedback_template(bucket)
         
         # Generate main feedback text
         reward_type, points = self.determine_reward(similarity_score)
         reward_desc = self.reward_criteria[reward_type]["description"]
         
-        feedback_text = f"{reward_desc} "
-        
-        if similarity_score >= 0.8:
-            feedback_text += "You've shown excellent understanding of this topic. Your response demonstrates clear thinking and good use of relevant concepts."
-        elif similarity_score >= 0.6:
-            feedback_text += "You're on the right track! Your response shows good understanding, with room for more detail and precision."
-        else:
-            feedback_text += "Keep working on this topic. Review the key concepts and try to be more specific in your explanations."
+        feedback_text = f"{reward_desc} {summary}"
         
         return {
             "feedback_text": feedback_text,
-            "strengths": strengths,
-            "improvement_areas": improvement_areas,
-            "tips": tips,
+            "strengths": list(strengths),
+            "improvement_areas": list(improvement_areas),
+            "tips": list(tips),
             "reward_type": reward_type,
             "points": points
         }
     
+    def _record_feedback(self, student_response: StudentResponse, similarity_score: float,
+                         best_matches: List[str], now: datetime.datetime) -> Feedback:
+        """Build, store and alert on feedback for an analyzed response"""
+        # Generate personalized feedback
+        feedback_data = self.generate_personalized_feedback(
+            student_response, similarity_score, best_matches
+        )
+        
+        # Create feedback object
+        feedback = Feedback(
+            response_id=f"resp_{now.strftime('%Y%m%d_%H%M%S')}_{next(self._id_counter)}",
+            student_id=student_response.student_id,
+            similarity_score=similarity_score,
+            reward_type=feedback_data["reward_type"],
+            feedback_text=feedback_data["feedback_text"],
+            strengths=feedback_data["strengths"],
+            improvement_areas=feedback_data["improvement_areas"],
+            personalized_tips=feedback_data["tips"],
+            points_earned=feedback_data["points"],
+            timestamp=now
+        )
+        
+        # Store feedback
+        self.feedback_history.append(feedback)
+        self._update_student_stats(feedback)
+        
+        # Generate educator alerts if needed
+        self._check_for_educator_alerts(student_response, similarity_score, now)
+        
+        logger.info(f"Generated feedback for student {student_response.student_id}")
+        return feedback
+    
     def generate_feedback(self, student_response: StudentResponse) -> Feedback:
         """Main method to generate comprehensive feedback"""
+        return self.generate_feedback_batch([student_response])[0]
+    
+    def generate_feedback_batch(self, student_responses: List[StudentResponse]) -> List[Feedback]:
+        """Generate feedback for several responses with one encoder pass"""
         try:
-            # Analyze the response
-            similarity_score, best_matches = self.analyze_response(student_response)
-            
-            # Generate personalized feedback
-            feedback_data = self.generate_personalized_feedback(
-                student_response, similarity_score, best_matches
-            )
-            
-            # Create feedback object
-            feedback = Feedback(
-                response_id=f"resp_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}",
-                student_id=student_response.student_id,
-                similarity_score=similarity_score,
-                reward_type=feedback_data["reward_type"],
-                feedback_text=feedback_data["feedback_text"],
-                strengths=feedback_data["strengths"],
-                improvement_areas=feedback_data["improvement_areas"],
-                personalized_tips=feedback_data["tips"],
-                points_earned=feedback_data["points"],
-                timestamp=datetime.datetime.now()
-            )
+            # Analyze all responses together
+            analyses = self.analyze_responses(student_responses)
+            now = datetime.datetime.now()
             
-            # Store feedback
-            self.feedback_history.append(feedback)
-            
-            # Generate educator alerts if needed
-            self._check_for_educator_alerts(student_response, similarity_score)
-            
-            logger.info(f"Generated feedback for student {student_response.student_id}")
-            return feedback
+            return [self._record_feedback(student_response, similarity_score, best_matches, now)
+                    for student_response, (similarity_score, best_matches)
+                    in zip(student_responses, analyses)]
             
         except Exception as e:
             logger.error(f"Error generating feedback: {str(e)}")
             raise
     
-    def _check_for_educator_alerts(self, student_response: StudentResponse, similarity_score: float):
+    def _update_student_stats(self, feedback: Feedback):
+        """Fold a new feedback record into the running aggregates"""
+        stats = self._per_student.get(feedback.student_id)
+        if stats is None:
+            stats = self._per_student[feedback.student_id] = {
+                "scores": [],
+                "total_points": 0,
+                "reward_counts": {reward_type.value: 0 for reward_type in RewardType},
+                "last_timestamp": None,
+                "recent_scores": deque(maxlen=5)
+            }
+        
+        stats["scores"].append(feedback.similarity_score)
+        stats["total_points"] += feedback.points_earned
+        stats["reward_counts"][feedback.reward_type.value] += 1
+        stats["last_timestamp"] = feedback.timestamp
+        stats["recent_scores"].append(feedback.similarity_score)
+        
+        self.class_score_sum += feedback.similarity_score
+        self.class_score_count += 1
+    
+    def _check_for_educator_alerts(self, student_response: StudentResponse, similarity_score: float,
+                                   now: datetime.datetime):
         """Check if educator alerts should be generated"""
         alerts = []
         
         # Low performance alert
         if similarity_score < 0.3:
             alert = EducatorAlert(
-                alert_id=f"alert_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}",
+                alert_id=f"alert_{now.strftime('%Y%m%d_%H%M%S')}_{next(self._id_counter)}",
                 student_id=student_response.student_id,
                 alert_type="low_performance",
                 severity="high",
                 description=f"Student showing very low understanding in {student_response.subject}",
-                timestamp=datetime.datetime.now(),
+                timestamp=now,
                 action_required=True
             )
             alerts.append(alert)
         
-        # Consistent struggle alert (check recent history)
-        recent_scores = [f.similarity_score for f in self.feedback_history[-5:] 
-                        if f.student_id == student_response.student_id]
+        # Consistent struggle alert (check the student's last five scores)
+        recent_scores = self._per_student[student_response.student_id]["recent_scores"]
         
         if len(recent_scores) >= 3 and all(score < 0.5 for score in recent_scores):
             alert = EducatorAlert(
-                alert_id=f"alert_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}_pattern",
+                alert_id=f"alert_{now.strftime('%Y%m%d_%H%M%S')}_{next(self._id_counter)}_pattern",
                 student_id=student_response.student_id,
                 alert_type="consistent_struggle",
                 severity="medium",
                 description=f"Student showing consistent difficulties across multiple responses",
-                timestamp=datetime.datetime.now(),
+                timestamp=now,
                 action_required=True
             )
             alerts.append(alert)
         
         self.educator_alerts.extend(alerts)
+        self._recent_alert_dicts.extend((alert.timestamp, asdict(alert)) for alert in alerts)
     
     def get_student_progress(self, student_id: str) -> Dict:
         """Get comprehensive progress report for a student"""
-        student_feedback = [f for f in self.feedback_history if f.student_id == student_id]
+        stats = self._per_student.get(student_id)
         
-        if not student_feedback:
+        if not stats:
             return {"error": "No feedback found for this student"}
         
-        # Calculate statistics
-        scores = [f.similarity_score for f in student_feedback]
-        total_points = sum(f.points_earned for f in student_feedback)
-        
-        reward_counts = {}
-        for reward_type in RewardType:
-            reward_counts[reward_type.value] = len([f for f in student_feedback 
-                                                  if f.reward_type == reward_type])
+        scores = stats["scores"]
         
         progress_report = {
             "student_id": student_id,
-            "total_responses": len(student_feedback),
+            "total_responses": len(scores),
             "average_score": np.mean(scores),
             "latest_score": scores[-1],
-            "total_points": total_points,
-            "reward_distribution": reward_counts,
+            "total_points": stats["total_points"],
+            "reward_distribution": dict(stats["reward_counts"]),
             "recent_improvement": scores[-1] - scores[0] if len(scores) > 1 else 0,
-            "last_updated": student_feedback[-1].timestamp.isoformat()
+            "last_updated": stats["last_timestamp"].isoformat()
         }
         
         return progress_report
@@ -333,23 +700,20 @@ class FeedbackGenerator:
     def get_educator_dashboard(self) -> Dict:
         """Generate educator dashboard with alerts and class overview"""
         # Get all unique students
-        all_students = list(set(f.student_id for f in self.feedback_history))
+        all_students = list(self._per_student)
         
         # Calculate class statistics
-        all_scores = [f.similarity_score for f in self.feedback_history]
-        class_average = np.mean(all_scores) if all_scores else 0
+        class_average = self.class_score_sum / self.class_score_count if self.class_score_count else 0
         
-        # Get students needing attention
-        struggling_students = []
-        for student_id in all_students:
-            recent_scores = [f.similarity_score for f in self.feedback_history[-3:] 
-                           if f.student_id == student_id]
-            if recent_scores and np.mean(recent_scores) < 0.4:
-                struggling_students.append(student_id)
+        # Get students needing attention (average of each student's last three scores)
+        struggling_students = [student_id for student_id, stats in self._per_student.items()
+                               if np.mean(list(stats["recent_scores"])[-3:]) < 0.4]
         
-        # Get recent alerts
-        recent_alerts = [alert for alert in self.educator_alerts 
-                        if alert.timestamp > datetime.datetime.now() - datetime.timedelta(days=7)]
+        # Get recent alerts, dropping ones that have aged out of the window
+        now = datetime.datetime.now()
+        cutoff = now - datetime.timedelta(days=7)
+        while self._recent_alert_dicts and self._recent_alert_dicts[0][0] <= cutoff:
+            self._recent_alert_dicts.popleft()
         
         dashboard = {
             "class_overview": {
@@ -358,32 +722,64 @@ class FeedbackGenerator:
                 "class_average_score": class_average,
                 "students_needing_attention": len(struggling_students)
             },
-            "recent_alerts": [asdict(alert) for alert in recent_alerts],
+            # Alert fields are all scalars, so a shallow copy keeps the cache private
+            "recent_alerts": [dict(alert_dict) for _, alert_dict in self._recent_alert_dicts],
             "struggling_students": struggling_students,
-            "last_updated": datetime.datetime.now().isoformat()
+            "last_updated": now.isoformat()
         }
         
         return dashboard
     
-    def export_data(self, filename: str = None) -> str:
-        """Export all feedback data to JSON file"""
+    def export_data(self, filename: str = None, pretty: bool = False) -> str:
+        """Export all feedback data to JSON file (indented when pretty)"""
+        now = datetime.datetime.now()
         if not filename:
-            filename = f"feedback_data_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+            filename = f"feedback_data_{now.strftime('%Y%m%d_%H%M%S')}.json"
         
-        export_data = {
-            "feedback_history": [asdict(f) for f in self.feedback_history],
-            "educator_alerts": [asdict(a) for a in self.educator_alerts],
-            "export_timestamp": datetime.datetime.now().isoformat()
-        }
+        # orjson serializes dataclasses, datetimes and enums natively in C
+        if orjson is not None:
+            data = orjson.dumps({
+                "feedback_history": self.feedback_history,
+                "educator_alerts": self.educator_alerts,
+                "export_timestamp": now.isoformat()
+            }, option=orjson.OPT_INDENT_2 if pretty else 0)
+            with open(filename, 'wb') as f:
+                f.write(data)
+            
+            logger.info(f"Data exported to {filename}")
+            return filename
         
-        # Convert datetime objects to strings for JSON serialization
-        def convert_datetime(obj):
+        # Convert datetime and enum values to strings for JSON serialization
+        def convert_value(obj):
             if isinstance(obj, datetime.datetime):
                 return obj.isoformat()
-            return obj
+            if isinstance(obj, Enum):
+                return obj.value
+            raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+        
+        # Lay out the document like orjson: two-space indents when pretty,
+        # otherwise a single compact line
+        if pretty:
+            indent, separators, newline = 2, (",", ": "), "\n"
+        else:
+            indent, separators, newline = None, (",", ":"), ""
+        step = " " * (indent or 0)
+        
+        # Stream one record at a time through a 64 KiB buffer instead of
+        # building the whole document in memory
+        def write_records(f, key, records):
+            f.write(f'{newline}{step}"{key}"{separators[1]}[')
+            for i, record in enumerate(records):
+                text = json.dumps(asdict(record), indent=indent, separators=separators, default=convert_value)
+                f.write(("," if i else "") + newline + step * 2 + text.replace("\n", newline + step * 2))
+            f.write((newline + step if records else "") + "]")
         
-        with open(filename, 'w') as f:
-            json.dump(export_data, f, default=convert_datetime, indent=2)
+        with open(filename, 'w', buffering=64 * 1024) as f:
+            f.write("{")
+            write_records(f, "feedback_history", self.feedback_history)
+            f.write(",")
+            write_records(f, "educator_alerts", self.educator_alerts)
+            f.write(f',{newline}{step}"export_timestamp"{separators[1]}{json.dumps(now.isoformat())}{newline}}}')
         
         logger.info(f"Data exported to {filename}")
         return filename
@@ -5,12 +5,16 @@ echo "================================================"
 
 # Check if Python 3 is installed
 if ! command -v python3 &> /dev/null; then
-    echo "❌ Python 3 is not installed. Please install Python 3.8 or higher."
+    echo "❌ Python 3 is not installed. Please install Python 3.10 or higher."
     exit 1
 fi
 
 # Check Python version
 python_version=$(python3 -c "import sys; print('.'.join(map(str, sys.version_info[:2])))")
+if ! python3 -c "import sys; sys.exit(sys.version_info < (3, 10))"; then
+    echo "❌ Python $python_version found, but Python 3.10 or higher is required."
+    exit 1
+fi
 echo "✅ Python version: $python_version"
 
 # Create virtual environment
@@ -7,12 +7,16 @@ setup(
     author="Your Name",
     packages=find_packages(),
     install_requires=[
-        "sentence-transformers==2.2.2",
+        "sentence-transformers>=2.7.0",
         "torch>=1.13.0",
         "numpy>=1.21.0",
-        "pandas>=1.3.0",
-        "scikit-learn>=1.0.0",
         "transformers>=4.21.0"
     ],
-    python_requires=">=3.8",
+    extras_require={
+        "onnx": ["optimum[onnxruntime]>=1.8.0"],
+        "simd": ["simsimd>=3.0.0"],
+        "export": ["orjson>=3.0.0"],
+        "jit": ["numba>=0.56.0"]
+    },
+    python_requires=">=3.10",
 )